@@ -1,6 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
 from pathlib import Path
 
-from analytics_project.data_scrubber import DataScrubber
+from analytics_project.data_preparation.prep_pipeline import SPECS, PrepSpec, run_prep
+from analytics_project.utils_logger import flush_logs
 
 
 # Project paths
@@ -8,57 +11,37 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 RAW_DIR = PROJECT_ROOT / "data" / "raw"
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 
+# Set to 1 to run the prep steps one after another (easier to debug/profile).
+SERIAL_ENV = "ANALYTICS_SERIAL_PREP"
 
-def prep_customers() -> None:
-    raw_path = RAW_DIR / "customers_data.csv"
-    out_path = PROCESSED_DIR / "customers_data_clean.csv"
 
-    scrubber = (
-        DataScrubber.from_csv(raw_path)
-        .standardize_column_names()
-        .strip_whitespace()
-        .drop_empty_rows()
-        .drop_duplicates()
-    )
+def _run_one(spec: PrepSpec) -> None:
+    try:
+        run_prep(spec)
+    finally:
+        # Pool workers exit without logging's at-exit flush
+        flush_logs()
 
-    scrubber.to_csv(out_path, index=False)
 
-
-def prep_products() -> None:
-    raw_path = RAW_DIR / "products_data.csv"
-    out_path = PROCESSED_DIR / "products_data_clean.csv"
-
-    scrubber = (
-        DataScrubber.from_csv(raw_path)
-        .standardize_column_names()
-        .strip_whitespace()
-        .drop_empty_rows()
-        .drop_duplicates()
-    )
-
-    scrubber.to_csv(out_path, index=False)
-
-
-def prep_sales() -> None:
-    raw_path = RAW_DIR / "sales_data.csv"
-    out_path = PROCESSED_DIR / "sales_data_clean.csv"
-
-    scrubber = (
-        DataScrubber.from_csv(raw_path)
-        .standardize_column_names()
-        .strip_whitespace()
-        .drop_empty_rows()
-        .drop_duplicates()
-    )
-
-    scrubber.to_csv(out_path, index=False)
+def _run_serially() -> bool:
+    if os.environ.get(SERIAL_ENV, "").strip() not in ("", "0"):
+        return True
+    return (os.cpu_count() or 1) < len(SPECS)
 
 
 def main() -> None:
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
-    prep_customers()
-    prep_products()
-    prep_sales()
+
+    # The three steps read and write disjoint files, so they can run in parallel.
+    if _run_serially():
+        for spec in SPECS:
+            _run_one(spec)
+    else:
+        # Flush first so forked workers do not inherit (and rewrite) buffered records
+        flush_logs()
+        with ProcessPoolExecutor(max_workers=len(SPECS)) as executor:
+            list(executor.map(_run_one, SPECS))
+
     print("Data prep complete. Clean files written to:", PROCESSED_DIR)
 
 
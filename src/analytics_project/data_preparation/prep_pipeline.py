@@ -0,0 +1,208 @@
+"""
+Shared cleaning pipeline for the prepare_*_data modules.
+
+Each raw table is described by a PrepSpec; `run_prep` loads, cleans and saves
+it with the same code path, so every table benefits from the same optimized
+steps.
+
+Run all tables from the project root with:
+    python -m analytics_project.data_preparation.prep_pipeline
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.io_utils import SCHEMAS, read_csv_to_df, write_parquet
+from analytics_project.utils_logger import get_logger
+
+LOGGER = get_logger(__name__)
+
+# ----- PATHS -----
+# __file__ is this file: src/analytics_project/data_preparation/prep_pipeline.py
+# parents[3] -> project root
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+DATA_RAW_DIR = PROJECT_ROOT / "data" / "raw"
+DATA_PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
+
+
+@dataclass(frozen=True)
+class PrepSpec:
+    """
+    How to prepare one raw table.
+
+    - name: table name used in log messages (e.g. "customers")
+    - raw / out: raw input CSV and cleaned output CSV
+    - key_cols: lower-case names of key columns; rows missing any are dropped
+    - fillna_zero_cols: columns whose missing values are filled with 0
+    - non_neg_cols: columns whose negative values are clipped to 0
+    - outliers_skip_ids: leave numeric ID-like columns out of outlier removal
+    """
+
+    name: str
+    raw: Path
+    out: Path
+    key_cols: frozenset[str]
+    fillna_zero_cols: tuple[str, ...] = ()
+    non_neg_cols: tuple[str, ...] = ()
+    outliers_skip_ids: bool = True
+
+
+CUSTOMERS_SPEC = PrepSpec(
+    name="customers",
+    raw=DATA_RAW_DIR / "customers_data.csv",
+    out=DATA_PROCESSED_DIR / "customers_data_clean.csv",
+    key_cols=frozenset({"customerid", "customer_id", "name", "customername"}),
+    fillna_zero_cols=("TotalSpend",),
+    outliers_skip_ids=False,
+)
+
+PRODUCTS_SPEC = PrepSpec(
+    name="products",
+    raw=DATA_RAW_DIR / "products_data.csv",
+    out=DATA_PROCESSED_DIR / "products_data_clean.csv",
+    key_cols=frozenset({"productid", "product_id", "sku", "name", "productname"}),
+    fillna_zero_cols=("StockQuantity",),
+    non_neg_cols=("StockQuantity",),
+)
+
+SALES_SPEC = PrepSpec(
+    name="sales",
+    raw=DATA_RAW_DIR / "sales_data.csv",
+    out=DATA_PROCESSED_DIR / "sales_data_clean.csv",
+    key_cols=frozenset(
+        {
+            "saleid",
+            "sale_id",
+            "salesid",
+            "sales_id",
+            "customerid",
+            "customer_id",
+            "productid",
+            "product_id",
+            "orderid",
+            "order_id",
+            "date",
+            "orderdate",
+        }
+    ),
+    fillna_zero_cols=("QuantitySold",),
+    non_neg_cols=("QuantitySold",),
+)
+
+SPECS = [CUSTOMERS_SPEC, PRODUCTS_SPEC, SALES_SPEC]
+
+
+def load_table(spec: PrepSpec) -> pd.DataFrame:
+    """Load the raw table described by `spec`, using its declared schema if any."""
+    LOGGER.info("Loading %s data from %s", spec.name, spec.raw)
+    df = read_csv_to_df(spec.raw, **SCHEMAS.get(spec.raw.name, {}))
+    LOGGER.info("Raw %s shape: %s", spec.name, df.shape)
+    return df
+
+
+def clean_table(df: pd.DataFrame, spec: PrepSpec) -> pd.DataFrame:
+    """
+    Clean a raw table:
+    - remove duplicates
+    - drop rows missing key fields
+    - fill missing values with 0 / clip negatives to 0 in the spec's columns
+    - remove extreme outliers in numeric columns
+
+    Each row filter is computed as a boolean mask and the masks are applied
+    together with a single `.loc`, so the frame is only sliced once.
+    """
+    # Shallow copy so the fills below never modify the caller's frame
+    df = df.copy(deep=False)
+
+    # 1) Exact duplicate rows
+    dup_mask = ~df.duplicated().to_numpy()
+    LOGGER.info("Dropped %d duplicate %s rows", (~dup_mask).sum(), spec.name)
+
+    # 2) Rows missing key fields
+    keep = dup_mask
+    key_cols = [c for c in df.columns if c.lower() in spec.key_cols]
+    if key_cols:
+        key_mask = df[key_cols].notna().all(axis=1).to_numpy()
+        keep = dup_mask & key_mask
+        LOGGER.info(
+            "Dropped %d rows with missing key %s fields (%s)",
+            (dup_mask & ~key_mask).sum(),
+            spec.name,
+            key_cols,
+        )
+
+    # 3) Fill missing values with 0, then set any negatives to 0 with a single clip
+    for col in spec.fillna_zero_cols:
+        if col in df.columns:
+            missing_before = df[col].isna().to_numpy()[keep].sum()
+            df[col] = df[col].fillna(0)
+            LOGGER.info("Filled %d missing %s values with 0", missing_before, col)
+
+    for col in spec.non_neg_cols:
+        if col in df.columns:
+            negatives = (df[col] < 0).to_numpy(dtype=bool, na_value=False)[keep].sum()
+            df[col] = df[col].clip(lower=0)
+            if negatives > 0:
+                LOGGER.info("Set %d negative %s values to 0", negatives, col)
+
+    # 4) Extreme outliers in numeric columns (IQR method)
+    numeric_cols = list(df.select_dtypes(include="number").columns)
+    if spec.outliers_skip_ids:
+        # Ignore numeric ID-like columns so we don't delete valid rows.
+        numeric_cols = [c for c in numeric_cols if "id" not in c.lower()]
+    # Skipped when steps 1-2 left no rows: there are no quartiles to compute.
+    if numeric_cols and keep.any():
+        LOGGER.info(
+            "Removing outliers from numeric columns: %s",
+            numeric_cols,
+        )
+        # Quartiles come from the rows that survived steps 1-2 only; all
+        # columns are bounded at once.
+        values = df[numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        q1, q3 = np.nanpercentile(values[keep], [25, 75], axis=0)
+        iqr = q3 - q1
+        lower = q1 - 1.5 * iqr
+        upper = q3 + 1.5 * iqr
+        num_mask = ((values >= lower) & (values <= upper)).all(axis=1)
+        LOGGER.info("Removed %d rows as numeric outliers", (keep & ~num_mask).sum())
+        keep = keep & num_mask
+
+    df = df.loc[keep].reset_index(drop=True)
+
+    LOGGER.info("Final %s shape after cleaning: %s", spec.name, df.shape)
+    return df
+
+
+def save_table(df: pd.DataFrame, spec: PrepSpec) -> None:
+    """Save a cleaned table (plus its Parquet sibling) to the processed folder."""
+    spec.out.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(spec.out, index=False)
+    LOGGER.info("Saved cleaned %s data to %s", spec.name, spec.out)
+    parquet_path = spec.out.with_suffix(".parquet")
+    if write_parquet(df, parquet_path):
+        LOGGER.info("Saved cleaned %s data to %s", spec.name, parquet_path)
+
+
+def run_prep(spec: PrepSpec) -> None:
+    """Run the load -> clean -> save steps for one table."""
+    LOGGER.info("=== Starting %s data preparation ===", spec.name)
+
+    df_raw = load_table(spec)
+    df_clean = clean_table(df_raw, spec)
+    save_table(df_clean, spec)
+
+    LOGGER.info("=== Finished %s data preparation ===", spec.name)
+
+
+def main() -> None:
+    """Prepare every table in SPECS."""
+    for spec in SPECS:
+        run_prep(spec)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Iterable, Dict
+from typing import Callable, Optional, Iterable, Dict
 
+import numpy as np
 import pandas as pd
 
+from analytics_project.io_utils import (
+    PARQUET_ROW_GROUP_SIZE,
+    pyarrow_available,
+    read_csv_to_df,
+    with_arrow_backend,
+)
+
+# DataScrubber relies on Copy-on-Write (always on from pandas 3.0) so it can
+# share data with the caller instead of deep-copying whole frames.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 
 class DataScrubber:
     """
@@ -19,11 +32,48 @@ class DataScrubber:
             .drop_duplicates()
         )
         clean_df = scrubber.get_df()
+
+    Cleaning steps are lazy: each method records an operation and returns
+    immediately. The recorded steps run once, in order, the first time the
+    frame is needed (`df`, `get_df`, `to_csv`, `to_parquet`). Redundant
+    neighbouring steps are skipped (see `_fuse`).
+
+    Requires pandas Copy-on-Write (enabled on import for pandas < 3.0). Frames
+    passed in and handed out are shallow copies: they share data until one side
+    writes, so the caller's DataFrame is never mutated and no bytes are copied
+    up front.
     """
 
     def __init__(self, df: pd.DataFrame) -> None:
-        # Work on a copy so we don't mutate the caller's DataFrame
-        self.df = df.copy()
+        # Shallow copy: under Copy-on-Write our edits never reach the caller's frame
+        self._df = df.copy(deep=False)
+        self._ops: list[tuple[tuple, Callable[[pd.DataFrame], pd.DataFrame]]] = []
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """The current DataFrame, with all pending cleaning steps applied."""
+        self._materialize()
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._ops.clear()
+        self._df = value
+
+    def _record(self, key: tuple, op: Callable[[pd.DataFrame], pd.DataFrame]) -> "DataScrubber":
+        """Queue `op`; `key` (step name + arguments) identifies it for fusing."""
+        self._ops.append((key, op))
+        return self
+
+    def _materialize(self) -> None:
+        """Run all pending steps on the frame, once."""
+        if not self._ops:
+            return
+        df = self._df
+        for _, op in _fuse(self._ops):
+            df = op(df)
+        self._ops.clear()
+        self._df = df
 
     # ---------- Constructors ----------
 
@@ -31,9 +81,32 @@ class DataScrubber:
     def from_csv(cls, path: str | Path, **read_kwargs) -> "DataScrubber":
         """Create a DataScrubber from a CSV file."""
         path = Path(path)
-        df = pd.read_csv(path, **read_kwargs)
+        df = read_csv_to_df(path, **read_kwargs)
         return cls(df)
 
+    @classmethod
+    def from_parquet(
+        cls, path: str | Path, columns: Optional[Iterable[str]] = None
+    ) -> "DataScrubber":
+        """
+        Create a DataScrubber from a Parquet file (requires pyarrow).
+
+        Pass `columns` to decode only those columns, e.g. just the key fields
+        needed for deduplication.
+        """
+        import pyarrow.parquet as pq
+
+        columns = list(columns) if columns is not None else None
+        table = pq.read_table(str(path), columns=columns, memory_map=True)
+        return cls(table.to_pandas(types_mapper=pd.ArrowDtype))
+
+    @classmethod
+    def from_csv_chunks(
+        cls, path: str | Path, chunksize: int = 500_000, **read_kwargs
+    ) -> "ChunkedDataScrubber":
+        """Create a streaming scrubber that reads the CSV `chunksize` rows at a time."""
+        return ChunkedDataScrubber(path, chunksize=chunksize, **read_kwargs)
+
     # ---------- Core cleaning methods ----------
 
     def standardize_column_names(self) -> "DataScrubber":
@@ -44,8 +117,13 @@ class DataScrubber:
         - converting to lowercase
         - replacing spaces with underscores
         """
-        self.df.columns = [str(col).strip().lower().replace(" ", "_") for col in self.df.columns]
-        return self
+
+        def op(df: pd.DataFrame) -> pd.DataFrame:
+            # Vectorized string ops on the Index instead of a per-column Python loop
+            names = df.columns.astype(str).str.strip().str.lower()
+            return df.set_axis(names.str.replace(" ", "_", regex=False), axis=1)
+
+        return self._record(("standardize_column_names",), op)
 
     def strip_whitespace(self, columns: Optional[Iterable[str]] = None) -> "DataScrubber":
         """
@@ -53,29 +131,25 @@ class DataScrubber:
 
         If `columns` is None, apply to all object/string columns.
         """
-        if columns is None:
-            columns = self.df.select_dtypes(include=["object", "string"]).columns
-
-        for col in columns:
-            if col in self.df.columns:
-                self.df[col] = self.df[col].astype("string").str.strip()
-
-        return self
+        columns = list(columns) if columns is not None else None
+        return self._record(
+            ("strip_whitespace", columns), lambda df: _strip_whitespace(df, columns)
+        )
 
     def drop_duplicates(self, subset: Optional[Iterable[str]] = None) -> "DataScrubber":
         """Drop duplicate rows, optionally based on a subset of columns."""
-        self.df = self.df.drop_duplicates(subset=subset)
-        return self
+        subset = list(subset) if subset is not None else None
+        return self._record(
+            ("drop_duplicates", subset), lambda df: df.drop_duplicates(subset=subset)
+        )
 
     def drop_empty_rows(self) -> "DataScrubber":
         """Drop rows where all values are NaN."""
-        self.df = self.df.dropna(how="all")
-        return self
+        return self._record(("drop_empty_rows",), lambda df: df.dropna(how="all"))
 
     def drop_empty_columns(self) -> "DataScrubber":
         """Drop columns where all values are NaN."""
-        self.df = self.df.dropna(axis=1, how="all")
-        return self
+        return self._record(("drop_empty_columns",), lambda df: df.dropna(axis=1, how="all"))
 
     def drop_na_rows(self, subset: Optional[Iterable[str]] = None) -> "DataScrubber":
         """
@@ -83,15 +157,15 @@ class DataScrubber:
 
         If `subset` is provided, only consider those columns.
         """
-        self.df = self.df.dropna(subset=subset)
-        return self
+        subset = list(subset) if subset is not None else None
+        return self._record(("drop_na_rows", subset), lambda df: df.dropna(subset=subset))
 
     def fill_na(self, fill_values: Dict[str, object]) -> "DataScrubber":
         """
         Fill NaN values using a mapping of {column_name: value}.
         """
-        self.df = self.df.fillna(value=fill_values)
-        return self
+        fill_values = dict(fill_values)
+        return self._record(("fill_na", repr(fill_values)), lambda df: df.fillna(value=fill_values))
 
     def cast_column_types(self, type_map: Dict[str, str]) -> "DataScrubber":
         """
@@ -101,19 +175,229 @@ class DataScrubber:
 
         Columns that are missing are ignored.
         """
-        for col, dtype in type_map.items():
-            if col in self.df.columns:
-                self.df[col] = self.df[col].astype(dtype, errors="ignore")
-        return self
+        type_map = dict(type_map)
+
+        def op(df: pd.DataFrame) -> pd.DataFrame:
+            df = df.copy(deep=False)
+            for col, dtype in type_map.items():
+                if col in df.columns:
+                    df[col] = df[col].astype(dtype, errors="ignore")
+            return df
+
+        return self._record(("cast_column_types", repr(type_map)), op)
 
     # ---------- Output helpers ----------
 
     def get_df(self) -> pd.DataFrame:
-        """Return a copy of the cleaned DataFrame."""
-        return self.df.copy()
+        """Return the cleaned DataFrame (a shallow, Copy-on-Write copy)."""
+        return self.df.copy(deep=False)
 
     def to_csv(self, path: str | Path, index: bool = False, **to_csv_kwargs) -> None:
         """Save the cleaned DataFrame to CSV."""
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
         self.df.to_csv(path, index=index, **to_csv_kwargs)
+
+    def to_parquet(self, path: str | Path, row_group_size: int = PARQUET_ROW_GROUP_SIZE) -> None:
+        """Save the cleaned DataFrame to a zstd-compressed Parquet file (requires pyarrow)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.df.to_parquet(
+            path,
+            engine="pyarrow",
+            index=False,
+            compression="zstd",
+            row_group_size=row_group_size,
+            use_dictionary=True,
+        )
+
+
+def _fuse(
+    ops: list[tuple[tuple, Callable[[pd.DataFrame], pd.DataFrame]]],
+) -> list[tuple[tuple, Callable[[pd.DataFrame], pd.DataFrame]]]:
+    """
+    Drop steps that cannot change the result of their neighbour:
+
+    - a step repeated with the same arguments (every cleaning step is idempotent)
+    - drop_empty_rows next to drop_na_rows() with no subset, which already
+      removes every row that has any NaN
+    """
+    fused: list[tuple[tuple, Callable[[pd.DataFrame], pd.DataFrame]]] = []
+    for key, op in ops:
+        if fused:
+            prev_key = fused[-1][0]
+            if key == prev_key:
+                continue
+            if key == ("drop_empty_rows",) and prev_key == ("drop_na_rows", None):
+                continue
+            if key == ("drop_na_rows", None) and prev_key == ("drop_empty_rows",):
+                fused[-1] = (key, op)
+                continue
+        fused.append((key, op))
+    return fused
+
+
+def _strip_whitespace(df: pd.DataFrame, columns: Optional[list[str]]) -> pd.DataFrame:
+    if columns is None:
+        columns = df.select_dtypes(include=["object", "string"]).columns
+    columns = [col for col in columns if col in df.columns]
+    df = df.copy(deep=False)
+
+    if not _strip_whitespace_arrow(df, columns):
+        for col in columns:
+            df[col] = df[col].astype("string").str.strip()
+    return df
+
+
+def _strip_whitespace_arrow(df: pd.DataFrame, columns: list[str]) -> bool:
+    """
+    Strip `columns` of `df` in place with PyArrow's utf8_trim_whitespace kernel.
+
+    The columns come back Arrow-backed, so there is no per-column
+    `.astype("string")` round-trip. Returns False when pyarrow is missing or
+    a column cannot be converted (e.g. mixed Python objects), so the caller
+    can use the pandas path instead.
+    """
+    if not columns:
+        return True
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        return False
+
+    try:
+        table = pa.Table.from_pandas(df[columns], preserve_index=False)
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if not pa.types.is_string(field.type):
+                column = column.cast(pa.string())
+            table = table.set_column(i, field.name, pc.utf8_trim_whitespace(column))
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return False
+
+    stripped = table.to_pandas(types_mapper=pd.ArrowDtype)
+    stripped.index = df.index
+    for col in columns:
+        df[col] = stripped[col]
+    return True
+
+
+class ChunkedDataScrubber:
+    """
+    Streaming counterpart of DataScrubber for files too large to load at once.
+
+    Each chunk is cleaned with the standard DataScrubber steps and appended to
+    the output CSV, so peak memory is bounded by a single chunk. Duplicates are
+    detected across chunks with a running set of row hashes.
+
+    Example:
+        DataScrubber.from_csv_chunks("data/raw/sales_data.csv").stream_clean_to_csv(
+            "data/processed/sales_data_clean.csv"
+        )
+    """
+
+    def __init__(self, path: str | Path, chunksize: int = 500_000, **read_kwargs) -> None:
+        self.path = Path(path)
+        self.chunksize = chunksize
+        self.read_kwargs = read_kwargs
+
+    def stream_clean_to_csv(
+        self,
+        path: str | Path,
+        write_parquet: bool = False,
+        subset: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Clean the input chunk by chunk and write the result to `path`.
+
+        Applies standardize_column_names, drop_duplicates, drop_empty_rows and
+        strip_whitespace, in that order.
+
+        Args:
+            path: Output CSV file.
+            write_parquet: Also write a Parquet sibling (requires pyarrow).
+            subset: Standardized key columns to deduplicate on; rows with a
+                missing key are always kept.
+
+        Returns:
+            int: Number of rows written.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        subset = list(subset) if subset is not None else None
+
+        parquet = _ParquetSink(path.with_suffix(".parquet")) if write_parquet else None
+        seen: set[int] = set()
+        rows_written = 0
+        with path.open("w", newline="", encoding="utf-8") as out:
+            for i, chunk in enumerate(
+                pd.read_csv(
+                    self.path,
+                    chunksize=self.chunksize,
+                    memory_map=True,
+                    **with_arrow_backend(self.read_kwargs),
+                )
+            ):
+                df = DataScrubber(chunk).standardize_column_names().get_df()
+
+                # Keep rows whose key hash is new both within this chunk and overall.
+                keys = df if subset is None else df[subset]
+                hashes = pd.Index(pd.util.hash_pandas_object(keys, index=False).to_numpy())
+                keep = ~(hashes.duplicated() | hashes.isin(seen))
+                seen.update(hashes[keep])
+                if subset is not None:
+                    keep |= keys.isna().any(axis=1).to_numpy()
+
+                df = (
+                    DataScrubber(df.loc[np.asarray(keep)])
+                    .drop_empty_rows()
+                    .strip_whitespace()
+                    .get_df()
+                )
+                df.to_csv(out, index=False, header=i == 0)
+                if parquet is not None:
+                    parquet.write(df)
+                rows_written += len(df)
+
+        # Close the Parquet file after the CSV so it is never older than it.
+        if parquet is not None:
+            parquet.close()
+        return rows_written
+
+
+class _ParquetSink:
+    """Append DataFrame chunks to one Parquet file, one row group per chunk."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._writer = None
+        self._failed = not pyarrow_available()
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self._failed:
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        try:
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(
+                    str(self.path), table.schema, compression="zstd", use_dictionary=True
+                )
+            elif table.schema != self._writer.schema:
+                table = table.cast(self._writer.schema)
+            self._writer.write_table(table, row_group_size=PARQUET_ROW_GROUP_SIZE)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            self._abort()
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _abort(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self._failed = True
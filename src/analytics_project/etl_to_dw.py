@@ -7,14 +7,26 @@ Dimensions:    dim_customer, dim_product
 Source files:  data/processed/customers_data_clean.csv
                data/processed/products_data_clean.csv
                data/processed/sales_data_clean.csv
+               (a fresher .parquet sibling is read instead when present)
+
+Each source is streamed in chunks of ETL_CHUNKSIZE rows, so peak memory is
+bounded by one chunk rather than the whole file. The load is skipped when
+neither the source files nor the loader code have changed since the last
+load (see the meta table); pass force=True to reload anyway.
 """
 
+import itertools
+import json
 import pathlib
 import sqlite3
 import sys
 
+import numpy as np
 import pandas as pd
 
+from analytics_project import io_utils
+from analytics_project.io_utils import iter_processed, pyarrow_available
+
 # ---------------------------------------------------------------------------
 # Paths and constants
 # ---------------------------------------------------------------------------
@@ -29,14 +41,66 @@ DW_DIR.mkdir(parents=True, exist_ok=True)
 
 DB_PATH = DW_DIR / "smart_sales.db"  # matches Dr. Case's examples
 
+CUSTOMERS_PATH = PROCESSED_DIR / "customers_data_clean.csv"
+PRODUCTS_PATH = PROCESSED_DIR / "products_data_clean.csv"
+SALES_PATH = PROCESSED_DIR / "sales_data_clean.csv"
+SOURCE_PATHS = (CUSTOMERS_PATH, PRODUCTS_PATH, SALES_PATH)
+# Code that decides what gets loaded; editing it invalidates the last load
+LOADER_PATHS = (pathlib.Path(__file__).resolve(), pathlib.Path(io_utils.__file__).resolve())
+
+# meta key holding the size/mtime signature of the sources and loader of the last load
+SOURCE_SIGNATURE_KEY = "source_signature"
+
+ETL_CHUNKSIZE = 200_000
+
+
+# Read dtypes per source, keyed by lower-case column name since iter_processed
+# lower-cases the headers. They are the raw files' declared dtypes (see
+# io_utils.SCHEMAS), so prep and ETL read each column the same way.
+def _source_dtypes(raw_name: str) -> dict[str, str]:
+    return {col.lower(): dtype for col, dtype in io_utils.SCHEMAS[raw_name]["dtype"].items()}
+
+
+CUSTOMERS_DTYPES = _source_dtypes("customers_data.csv")
+PRODUCTS_DTYPES = _source_dtypes("products_data.csv")
+SALES_DTYPES = _source_dtypes("sales_data.csv")
+
+# YYYY-MM-DD at the start of a value, with a plausible month and day
+ISO_DATE = r"\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])"
+
+# Bulk-load settings. The DW is rebuilt from data/processed on every run, so
+# durability is traded for speed: a crash mid-load just means re-running it.
+LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-200000",  # ~200 MB page cache
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
 
 # ---------------------------------------------------------------------------
 # Schema creation
 # ---------------------------------------------------------------------------
 
 
+# Helpful indexes for queries: index name -> indexed fact_sales column
+FACT_SALES_INDEXES = {
+    "idx_fact_sales_customer": "CustomerID",
+    "idx_fact_sales_product": "ProductID",
+    "idx_fact_sales_store": "StoreID",
+}
+
+
 def create_schema(conn: sqlite3.Connection) -> None:
     """Create star schema tables and indexes if they do not exist."""
+    create_tables(conn)
+    create_indexes(conn)
+    conn.commit()
+
+
+def create_tables(conn: sqlite3.Connection) -> None:
+    """Create the star schema tables if they do not exist (does not commit)."""
     cursor = conn.cursor()
 
     cursor.execute(
@@ -83,21 +147,33 @@ def create_schema(conn: sqlite3.Connection) -> None:
         """
     )
 
-    # Helpful indexes for queries
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fact_sales_customer ON fact_sales (CustomerID)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fact_sales_product ON fact_sales (ProductID)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fact_sales_store ON fact_sales (StoreID)")
+    # Bookkeeping for load_data_to_dw (not part of the star schema)
+    cursor.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, val TEXT)")
 
-    conn.commit()
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    """Create the fact_sales indexes if they do not exist."""
+    for name, column in FACT_SALES_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON fact_sales ({column})")
 
 
 def delete_existing_records(conn: sqlite3.Connection) -> None:
-    """Clear existing data so the DW can be fully reloaded."""
+    """
+    Clear existing data so the DW can be fully reloaded.
+
+    The tables are dropped and recreated empty rather than emptied with
+    DELETE, which would write every old row to the journal. Dropping
+    fact_sales also drops its indexes; load_data_to_dw rebuilds them once
+    after the load.
+
+    Does not commit: load_data_to_dw runs the delete and the reload in one
+    transaction.
+    """
     cursor = conn.cursor()
-    cursor.execute("DELETE FROM fact_sales")
-    cursor.execute("DELETE FROM dim_customer")
-    cursor.execute("DELETE FROM dim_product")
-    conn.commit()
+    cursor.execute("DROP TABLE IF EXISTS fact_sales")
+    cursor.execute("DROP TABLE IF EXISTS dim_customer")
+    cursor.execute("DROP TABLE IF EXISTS dim_product")
+    create_tables(conn)
 
 
 # ---------------------------------------------------------------------------
@@ -105,13 +181,62 @@ def delete_existing_records(conn: sqlite3.Connection) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _to_iso_dates(dates: pd.Series) -> pd.Series:
+    """
+    Return `dates` as ISO YYYY-MM-DD strings; values that are not dates become missing.
+
+    When every value already starts with an ISO date the strings are just
+    sliced, skipping the strftime round trip. They are still checked with a
+    fixed-format parse so impossible days (e.g. 2023-02-30) are rejected as
+    in the general path.
+    """
+    if dates.str.match(ISO_DATE).all():
+        iso = dates.str.slice(0, 10)
+        return iso.where(pd.to_datetime(iso, format="%Y-%m-%d", errors="coerce").notna())
+    return pd.to_datetime(dates, errors="coerce").dt.strftime("%Y-%m-%d")
+
+
+def _drop_seen(df: pd.DataFrame, key: str, seen: set) -> pd.DataFrame:
+    """Keep the first row per `key`, across all chunks seen so far, and record the new keys."""
+    values = df[key].to_numpy()
+    if values.dtype.kind in "iu":
+        # Integer keys: one np.unique pass gives the first row of each key
+        first = np.sort(np.unique(values, return_index=True)[1])
+        candidates = values[first].tolist()
+    else:
+        # Missing keys come back as pd.NA, so they match across chunks too
+        first = np.flatnonzero(~df[key].duplicated().to_numpy())
+        candidates = df[key].iloc[first].tolist()
+
+    new = np.fromiter((k not in seen for k in candidates), dtype=bool, count=len(candidates))
+    seen.update(itertools.compress(candidates, new))
+    return df.iloc[first[new]]
+
+
+def _bulk_insert(conn: sqlite3.Connection, table: str, cols: list[str], df: pd.DataFrame) -> None:
+    """
+    Insert the `cols` of `df` into `table` with a single executemany.
+
+    Values are converted to Python objects once, with NaN/NA bound as NULL.
+    With pyarrow the columns go through Arrow's to_pylist, which does that
+    conversion in C.
+    """
+    # Table and column names come from this module's constants, never from input data
+    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"  # noqa: S608
+    df = df[cols]
+    if pyarrow_available():
+        import pyarrow as pa
+
+        arrow = pa.Table.from_pandas(df, preserve_index=False)
+        rows = zip(*(column.to_pylist() for column in arrow.columns), strict=True)
+    else:
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    conn.executemany(sql, rows)
+
+
 def load_customers(conn: sqlite3.Connection) -> None:
     """Load customer dimension from processed CSV."""
-    path = PROCESSED_DIR / "customers_data_clean.csv"
-    df = pd.read_csv(path)
-
-    # Normalize column names from CSV (all lowercase)
-    df.columns = df.columns.str.strip().str.lower()
+    path = CUSTOMERS_PATH
 
     # Map CSV column names -> DW column names
     rename_map = {
@@ -122,28 +247,29 @@ def load_customers(conn: sqlite3.Connection) -> None:
         "loyaltypoints_num": "LoyaltyPoints_Num",
         "preferredcontactmethod_cat": "PreferredContactMethod_Cat",
     }
-    df = df.rename(columns=rename_map)
 
-    # Keep only the DW columns in the correct order
     cols = list(rename_map.values())
-    df = df[cols]
+    seen: set = set()
 
-    # Remove duplicate customers (keep first occurrence)
-    df = df.drop_duplicates(subset=["CustomerID"])
+    # Only read the columns the DW needs; chunks arrive with the DW column names
+    for df in iter_processed(
+        path,
+        columns=rename_map,
+        chunksize=ETL_CHUNKSIZE,
+        dtype=CUSTOMERS_DTYPES,
+    ):
+        # Remove duplicate customers (keep first occurrence, across chunks)
+        df = _drop_seen(df, "CustomerID", seen)
 
-    # Convert date to ISO format YYYY-MM-DD
-    df["JoinDate"] = pd.to_datetime(df["JoinDate"]).dt.strftime("%Y-%m-%d")
+        # Convert date to ISO format YYYY-MM-DD
+        df["JoinDate"] = _to_iso_dates(df["JoinDate"])
 
-    df.to_sql("dim_customer", conn, if_exists="append", index=False)
+        _bulk_insert(conn, "dim_customer", cols, df)
 
 
 def load_products(conn: sqlite3.Connection) -> None:
     """Load product dimension from processed CSV."""
-    path = PROCESSED_DIR / "products_data_clean.csv"
-    df = pd.read_csv(path)
-
-    # Normalize column names
-    df.columns = df.columns.str.strip().str.lower()
+    path = PRODUCTS_PATH
 
     rename_map = {
         "productid": "ProductID",
@@ -153,24 +279,21 @@ def load_products(conn: sqlite3.Connection) -> None:
         "currentdiscount_pct": "CurrentDiscount_Pct",
         "supplier_cat": "Supplier_Cat",
     }
-    df = df.rename(columns=rename_map)
-
     cols = list(rename_map.values())
-    df = df[cols]
+    seen: set = set()
 
-    # Remove duplicate products (keep first occurrence)
-    df = df.drop_duplicates(subset=["ProductID"])
+    for df in iter_processed(
+        path, columns=rename_map, chunksize=ETL_CHUNKSIZE, dtype=PRODUCTS_DTYPES
+    ):
+        # Remove duplicate products (keep first occurrence, across chunks)
+        df = _drop_seen(df, "ProductID", seen)
 
-    df.to_sql("dim_product", conn, if_exists="append", index=False)
+        _bulk_insert(conn, "dim_product", cols, df)
 
 
 def load_sales(conn: sqlite3.Connection) -> None:
     """Load fact table from processed sales CSV."""
-    path = PROCESSED_DIR / "sales_data_clean.csv"
-    df = pd.read_csv(path)
-
-    # Normalize column names
-    df.columns = df.columns.str.strip().str.lower()
+    path = SALES_PATH
 
     rename_map = {
         "transactionid": "TransactionID",
@@ -183,28 +306,19 @@ def load_sales(conn: sqlite3.Connection) -> None:
         "bonuspoints_num": "BonusPoints_Num",
         "paymenttype_cat": "PaymentType_Cat",
     }
-    df = df.rename(columns=rename_map)
-
     cols = list(rename_map.values())
-    df = df[cols]
-
-    # Remove duplicate transactions (keep first occurrence)
-    df = df.drop_duplicates(subset=["TransactionID"])
-
-    # Convert dates to datetime, coerce invalid ones to NaT
-    df["SaleDate"] = pd.to_datetime(
-        df["SaleDate"],
-        errors="coerce",
-        # infer_datetime_format=True  # optional; you can remove this if you like
-    )
+    seen: set = set()
 
-    # Drop rows where SaleDate could not be parsed
-    df = df.dropna(subset=["SaleDate"])
+    for df in iter_processed(path, columns=rename_map, chunksize=ETL_CHUNKSIZE, dtype=SALES_DTYPES):
+        # Remove duplicate transactions (keep first occurrence, across chunks)
+        df = _drop_seen(df, "TransactionID", seen)
 
-    # Format to ISO string YYYY-MM-DD for the DW
-    df["SaleDate"] = df["SaleDate"].dt.strftime("%Y-%m-%d")
+        # Format to ISO string YYYY-MM-DD for the DW and drop rows whose
+        # SaleDate could not be parsed
+        df["SaleDate"] = _to_iso_dates(df["SaleDate"])
+        df = df.loc[df["SaleDate"].notna().to_numpy()]
 
-    df.to_sql("fact_sales", conn, if_exists="append", index=False)
+        _bulk_insert(conn, "fact_sales", cols, df)
 
 
 # ---------------------------------------------------------------------------
@@ -212,22 +326,77 @@ def load_sales(conn: sqlite3.Connection) -> None:
 # ---------------------------------------------------------------------------
 
 
-def load_data_to_dw() -> None:
-    """Main function to create schema and load data into the DW."""
+def source_signature() -> str:
+    """
+    Path, size and mtime of every source file (including Parquet siblings) and loader module.
+
+    Cheap to compute: only stat() calls, no file contents are read. Paths are
+    stored relative to PROJECT_ROOT so the signature does not depend on where
+    the project is checked out.
+    """
+    sig = []
+    paths = [p for csv_path in SOURCE_PATHS for p in (csv_path, csv_path.with_suffix(".parquet"))]
+    for path in (*paths, *LOADER_PATHS):
+        if path.exists():
+            st = path.stat()
+            sig.append([_project_relative(path), st.st_size, st.st_mtime_ns])
+    return json.dumps(sig)
+
+
+def _project_relative(path: pathlib.Path) -> str:
+    try:
+        return path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _stored_signature(conn: sqlite3.Connection) -> str | None:
+    row = conn.execute("SELECT val FROM meta WHERE key = ?", (SOURCE_SIGNATURE_KEY,)).fetchone()
+    return row[0] if row else None
+
+
+def load_data_to_dw(force: bool = False) -> None:
+    """
+    Main function to create schema and load data into the DW.
+
+    Does nothing if the source files are unchanged since the last successful
+    load, unless `force` is True.
+    """
     print(f"Project root: {PROJECT_ROOT}")
     print(f"Using database at: {DB_PATH}")
 
     conn = sqlite3.connect(DB_PATH)
 
     try:
-        create_schema(conn)
-        delete_existing_records(conn)
-
-        load_customers(conn)
-        load_products(conn)
-        load_sales(conn)
-
-        conn.commit()
+        create_tables(conn)
+        signature = source_signature()
+        if not force and _stored_signature(conn) == signature:
+            print("Source files unchanged since the last load; skipping.")
+            return
+
+        # Only once a load will run, so a skipped run leaves the DW settings alone
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+
+        # One transaction for the whole reload: one fsync instead of one per
+        # statement, and readers never see half-loaded tables.
+        conn.execute("BEGIN")
+        try:
+            delete_existing_records(conn)
+
+            load_customers(conn)
+            load_products(conn)
+            load_sales(conn)
+
+            create_indexes(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, val) VALUES (?, ?)",
+                (SOURCE_SIGNATURE_KEY, signature),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
         print("Data warehouse load completed successfully.")
     finally:
         conn.close()
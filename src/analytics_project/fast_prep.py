@@ -0,0 +1,85 @@
+"""
+Single-pass Polars version of the DataScrubber prep chain.
+
+`scrub_csv_polars` runs the chain as one fused Polars LazyFrame query streamed
+to disk. The project's table prep runs through prep_pipeline.run_prep.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from analytics_project.io_utils import NA_VALUES, polars_enabled, polars_schema_overrides
+
+if TYPE_CHECKING:
+    import polars as pl
+
+__all__ = ["polars_enabled", "scrub_csv_polars"]
+
+
+def scrub_csv_polars(
+    raw_path: str | Path,
+    out_path: str | Path,
+    subset: list[str] | None = None,
+    usecols: list[str] | None = None,
+    dtype: dict[str, str] | None = None,
+) -> None:
+    """
+    Polars equivalent of the streaming DataScrubber chain:
+
+        standardize_column_names -> drop_duplicates -> drop_empty_rows -> strip_whitespace
+
+    All steps are fused into one lazy query that is streamed straight to
+    `out_path`, so the data is scanned once and never fully materialized.
+
+    `usecols` and `dtype` take pandas-style names and are applied as a column
+    projection and Polars `schema_overrides`.
+    """
+    import polars as pl
+
+    overrides = polars_schema_overrides(dtype) if dtype else None
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    (
+        pl.scan_csv(raw_path, null_values=NA_VALUES, schema_overrides=overrides)
+        .pipe(_select, usecols)
+        .pipe(_standardize_cols)
+        .pipe(_drop_duplicates, subset)
+        .pipe(_drop_all_null_rows)
+        .pipe(_strip_strings)
+        .sink_csv(out_path)
+    )
+
+
+def _select(lf: pl.LazyFrame, usecols: list[str] | None) -> pl.LazyFrame:
+    return lf if usecols is None else lf.select(usecols)
+
+
+def _standardize_cols(lf: pl.LazyFrame) -> pl.LazyFrame:
+    names = lf.collect_schema().names()
+    return lf.rename({c: c.strip().lower().replace(" ", "_") for c in names})
+
+
+def _drop_duplicates(lf: pl.LazyFrame, subset: list[str] | None) -> pl.LazyFrame:
+    """Keep the first row per key; rows with a missing key are always kept."""
+    import polars as pl
+
+    if not subset:
+        return lf.unique(maintain_order=True)
+    missing_key = pl.any_horizontal(pl.col(subset).is_null())
+    return lf.filter(pl.struct(subset).is_first_distinct() | missing_key)
+
+
+def _drop_all_null_rows(lf: pl.LazyFrame) -> pl.LazyFrame:
+    import polars as pl
+
+    return lf.filter(~pl.all_horizontal(pl.all().is_null()))
+
+
+def _strip_strings(lf: pl.LazyFrame) -> pl.LazyFrame:
+    import polars.selectors as cs
+
+    return lf.with_columns(cs.string().str.strip_chars())
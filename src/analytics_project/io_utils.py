@@ -0,0 +1,458 @@
+"""
+Shared file I/O helpers for the analytics pipeline.
+
+`read_csv_to_df` uses Polars' multi-threaded CSV reader when the
+``ANALYTICS_FAST_IO=polars`` flag is set, PyArrow's reader over a
+memory-mapped file when PyArrow is installed, and `pandas.read_csv` (also
+memory-mapped) otherwise.
+
+Processed tables are written as CSV (for external consumers such as Power BI)
+plus a Parquet sibling when PyArrow is available; `iter_processed` prefers the
+Parquet copy so downstream steps skip CSV parsing.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+import mmap
+import os
+from pathlib import Path
+
+import pandas as pd
+
+FAST_IO_ENV = "ANALYTICS_FAST_IO"
+
+# Parse in 8 MiB blocks so large files are split across reader threads.
+CSV_BLOCK_SIZE = 8 << 20
+
+PARQUET_ROW_GROUP_SIZE = 256_000
+
+# pandas' default NA tokens, so both readers agree on what counts as missing.
+NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+# Declared read dtypes per raw file (keyed by file name), so the known columns
+# skip type inference. Any other column is still read and inferred as usual.
+# Raw inputs may have blanks anywhere, so integers use the nullable Int32.
+# Money stays float64 so values survive the CSV/Parquet round trip unchanged;
+# SaleAmount holds "?" placeholders in the raw data, so it is read as text; the
+# OLAP queries only sum the values SQLite stored as numbers.
+SCHEMAS = {
+    "customers_data.csv": {
+        "dtype": {
+            "CustomerID": "Int32",
+            "Name": "str",
+            "Region": "str",
+            "JoinDate": "str",
+            "LoyaltyPoints_Num": "Int32",
+            "PreferredContactMethod_Cat": "str",
+        }
+    },
+    "products_data.csv": {
+        "dtype": {
+            "ProductID": "Int32",
+            "ProductName": "str",
+            "Category": "str",
+            "UnitPrice": "float64",
+            "CurrentDiscount_Pct": "Int32",
+            "Supplier_Cat": "str",
+        }
+    },
+    "sales_data.csv": {
+        "dtype": {
+            "TransactionID": "Int32",
+            "SaleDate": "str",
+            "CustomerID": "Int32",
+            "ProductID": "Int32",
+            "StoreID": "Int32",
+            "CampaignID": "Int32",
+            "SaleAmount": "str",
+            "BonusPoints_Num": "Int32",
+            "PaymentType_Cat": "str",
+        }
+    },
+}
+
+
+def polars_enabled() -> bool:
+    """Return True when the Polars fast path is requested and importable."""
+    if os.environ.get(FAST_IO_ENV, "").strip().lower() != "polars":
+        return False
+    try:
+        import polars  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# pandas dtype names -> Polars dtype attribute names, for `dtype=` translation.
+_POLARS_DTYPE_NAMES = {
+    "int8": "Int8",
+    "int16": "Int16",
+    "int32": "Int32",
+    "int64": "Int64",
+    "uint8": "UInt8",
+    "uint16": "UInt16",
+    "uint32": "UInt32",
+    "float32": "Float32",
+    "float64": "Float64",
+    "bool": "Boolean",
+    "boolean": "Boolean",
+    "object": "String",
+    "str": "String",
+    "string": "String",
+    "category": "Categorical",
+}
+
+
+def read_csv_to_df(path: str | Path, **read_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV file into a pandas DataFrame, using the fastest available reader.
+
+    1. Polars, when ``ANALYTICS_FAST_IO=polars`` is set. The pandas kwargs
+       `parse_dates`, `dtype` and `usecols` are translated; columns come back
+       Arrow-backed.
+    2. PyArrow (if installed) when the only `read_kwargs` are a list of
+       `usecols` and/or a `dtype` dict of simple numeric/string dtypes.
+    3. `pd.read_csv`, which accepts any pandas keyword arguments.
+
+    When PyArrow is installed, columns without a declared `dtype` come back
+    Arrow-backed (``dtype_backend="pyarrow"``). The `pd.read_csv` fallback only
+    does this for reads without a `dtype` (see with_arrow_backend).
+    """
+    path = Path(path)
+
+    if polars_enabled():
+        polars_kwargs = _polars_read_kwargs(read_kwargs)
+        if polars_kwargs is not None:
+            try:
+                return _read_csv_polars(path, polars_kwargs)
+            except ImportError:
+                pass
+
+    usecols = read_kwargs.get("usecols")
+    dtype = read_kwargs.get("dtype")
+    if (
+        set(read_kwargs) <= {"usecols", "dtype"}
+        and (usecols is None or isinstance(usecols, list | tuple))
+        and (dtype is None or (isinstance(dtype, dict) and _arrow_dtype_names(dtype)))
+    ):
+        try:
+            return _read_csv_pyarrow(path, usecols, dtype)
+        except ImportError:
+            pass
+
+    return pd.read_csv(path, memory_map=True, **with_arrow_backend(read_kwargs))
+
+
+def pyarrow_available() -> bool:
+    """Return True when pyarrow can be imported."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def with_arrow_backend(read_kwargs: dict) -> dict:
+    """
+    Add ``dtype_backend="pyarrow"`` to pandas read kwargs when pyarrow is installed.
+
+    Arrow-backed columns keep nullable integers as integers and avoid Python
+    string objects. Reads with an explicit `dtype` are left alone: the
+    declared dtypes already pick the representation, and pandas does not
+    apply them reliably together with `dtype_backend`.
+    """
+    if "dtype" in read_kwargs or "dtype_backend" in read_kwargs or not pyarrow_available():
+        return read_kwargs
+    return {**read_kwargs, "dtype_backend": "pyarrow"}
+
+
+def _mmap_open(path: str | Path) -> mmap.mmap:
+    """
+    Memory-map `path` read-only and hint the kernel that it is read front to back.
+
+    MADV_SEQUENTIAL lets the kernel read ahead aggressively and drop pages
+    behind the parser. The hint is skipped where unsupported (e.g. Windows).
+
+    The map is not closed here: Arrow may return columns that point into it,
+    so it is unmapped once the last buffer exported from it is released.
+    """
+    with Path(path).open("rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    return mm
+
+
+def _read_csv_polars(path: Path, polars_kwargs: dict) -> pd.DataFrame:
+    import polars as pl
+
+    frame = pl.read_csv(path, low_memory=False, null_values=NA_VALUES, **polars_kwargs)
+    # Needs pyarrow; raises ImportError without it so the caller can fall back.
+    return frame.to_pandas(use_pyarrow_extension_array=True)
+
+
+def _polars_read_kwargs(read_kwargs: dict) -> dict | None:
+    """Translate pandas read_csv kwargs to Polars, or return None if unsupported."""
+    polars_kwargs: dict = {}
+    for key, value in read_kwargs.items():
+        if key == "parse_dates":
+            polars_kwargs["try_parse_dates"] = bool(value)
+        elif key == "usecols" and isinstance(value, list | tuple):
+            polars_kwargs["columns"] = list(value)
+        elif key == "dtype" and isinstance(value, dict):
+            overrides = polars_schema_overrides(value)
+            if overrides is None:
+                return None
+            polars_kwargs["schema_overrides"] = overrides
+        else:
+            return None
+    return polars_kwargs
+
+
+# pandas dtype names the PyArrow reader can parse directly. Numbers are parsed
+# as float64 or int64 and narrowed by pandas afterwards (see _arrow_convert_options).
+_ARROW_STRING_DTYPES = {"object", "str", "string"}
+_ARROW_NUMERIC_DTYPES = {
+    *("int8", "int16", "int32", "int64", "uint8", "uint16", "uint32"),
+    *("Int8", "Int16", "Int32", "Int64", "float32", "float64"),
+}
+
+
+def _arrow_dtype_names(dtype: dict) -> bool:
+    return all(
+        str(t) in _ARROW_STRING_DTYPES or str(t) in _ARROW_NUMERIC_DTYPES for t in dtype.values()
+    )
+
+
+def polars_schema_overrides(dtype: dict[str, str]) -> dict | None:
+    """Translate a pandas `dtype=` dict to Polars `schema_overrides`, or None if unsupported."""
+    import polars as pl
+
+    overrides = {}
+    for col, name in dtype.items():
+        polars_name = _POLARS_DTYPE_NAMES.get(str(name).lower())
+        if polars_name is None:
+            return None
+        overrides[col] = getattr(pl, polars_name)
+    return overrides
+
+
+def _read_csv_pyarrow(
+    path: Path,
+    usecols: list[str] | tuple[str, ...] | None = None,
+    dtype: dict[str, str] | None = None,
+) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    if path.stat().st_size == 0:
+        # mmap cannot map an empty file; let pandas raise its usual error.
+        return pd.read_csv(path, usecols=usecols, dtype=dtype)
+
+    table = pacsv.read_csv(
+        pa.BufferReader(pa.py_buffer(_mmap_open(path))),
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=_arrow_convert_options(usecols, dtype),
+    )
+    if dtype is None:
+        return table.to_pandas(types_mapper=pd.ArrowDtype, split_blocks=True, self_destruct=True)
+    return _arrow_to_pandas(table, dtype)
+
+
+def _iter_csv_pyarrow(
+    path: Path, usecols: list[str] | None, dtype: dict[str, str]
+) -> Iterator[pd.DataFrame]:
+    """Stream `path` with PyArrow's CSV reader, one DataFrame per parsed block."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=CSV_BLOCK_SIZE),
+        convert_options=_arrow_convert_options(usecols, dtype),
+    )
+    for batch in reader:
+        yield _arrow_to_pandas(pa.Table.from_batches([batch]), dtype)
+
+
+def _arrow_to_pandas(table, dtype: dict) -> pd.DataFrame:
+    """Convert a parsed Arrow table: declared columns get `dtype`, the rest stay Arrow-backed."""
+    undeclared = [c for c in table.column_names if c not in dtype]
+    df = _narrow(table.drop_columns(undeclared).to_pandas(split_blocks=True), dtype)
+    if not undeclared:
+        return df
+    rest = table.select(undeclared).to_pandas(types_mapper=pd.ArrowDtype, split_blocks=True)
+    return pd.concat([df, rest], axis=1)[table.column_names]
+
+
+def _arrow_convert_options(usecols: list[str] | tuple[str, ...] | None, dtype: dict | None):
+    """PyArrow ConvertOptions matching pandas' `usecols`, `dtype` and NA handling."""
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    column_types = {}
+    for col, name in (dtype or {}).items():
+        name = str(name)
+        if name in _ARROW_STRING_DTYPES:
+            column_types[col] = pa.string()
+        elif name.lower() == "int64":
+            column_types[col] = pa.int64()
+        else:
+            # Floats and ints up to 32 bits: float64 holds them exactly and also
+            # accepts integral text like "0.0" (as pandas does). _narrow's astype
+            # then rejects NaN for non-nullable ints and non-integral values.
+            column_types[col] = pa.float64()
+
+    return pacsv.ConvertOptions(
+        include_columns=list(usecols) if usecols is not None else None,
+        column_types=column_types,
+        null_values=NA_VALUES,
+        strings_can_be_null=True,
+    )
+
+
+def _narrow(df: pd.DataFrame, dtype: dict) -> pd.DataFrame:
+    """
+    Narrow numeric columns to the requested pandas dtypes; string columns
+    already come back as pandas' default string dtype.
+
+    Integers parsed as float64 are cast through the nullable dtype first, so
+    non-integral values raise instead of being truncated.
+    """
+    numeric = {c: t for c, t in dtype.items() if str(t) not in _ARROW_STRING_DTYPES and c in df}
+    if not numeric:
+        return df
+    checked = {
+        c: str(t).replace("uint", "UInt").replace("int", "Int")
+        for c, t in numeric.items()
+        if str(t).startswith(("int", "uint")) and df[c].dtype.kind == "f"
+    }
+    if checked:
+        df = df.astype(checked)
+    return df.astype(numeric)
+
+
+def write_parquet(
+    df: pd.DataFrame, path: str | Path, row_group_size: int = PARQUET_ROW_GROUP_SIZE
+) -> bool:
+    """
+    Write `df` to a zstd-compressed, dictionary-encoded Parquet file.
+
+    Returns False (and writes nothing) when PyArrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return False
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(
+        table,
+        str(path),
+        row_group_size=row_group_size,
+        compression="zstd",
+        use_dictionary=True,
+    )
+    return True
+
+
+def _fresh_parquet(csv_path: Path) -> Path | None:
+    """
+    Return the Parquet sibling of `csv_path` if it can be used instead.
+
+    The Parquet file is only used when it is at least as new as the CSV, so a
+    CSV rewritten by a step that does not emit Parquet is never shadowed.
+    """
+    parquet_path = csv_path.with_suffix(".parquet")
+    if not parquet_path.exists() or not pyarrow_available():
+        return None
+    if csv_path.exists() and parquet_path.stat().st_mtime_ns < csv_path.stat().st_mtime_ns:
+        return None
+    return parquet_path
+
+
+def _matching_columns(names: Iterable[str], wanted: set[str] | None) -> list[str] | None:
+    if wanted is None:
+        return None
+    return [n for n in names if n.strip().lower() in wanted]
+
+
+def iter_processed(
+    csv_path: str | Path,
+    columns: Iterable[str] | None = None,
+    chunksize: int = 200_000,
+    dtype: dict[str, str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Read a processed table in chunks, preferring a fresh Parquet sibling.
+
+    Args:
+        csv_path: Processed CSV file.
+        columns: Columns to read, matched case-insensitively. A mapping of
+            {lower-case name: output name} also renames them.
+        chunksize: Rows per chunk (CSV read by PyArrow yields its parse blocks).
+        dtype: Read dtypes keyed by lower-case column name.
+
+    Returns:
+        Iterator of DataFrame chunks.
+    """
+    csv_path = Path(csv_path)
+    wanted = {c.strip().lower() for c in columns} if columns is not None else None
+    out_names = dict(columns) if isinstance(columns, Mapping) else None
+    dtype = dtype or {}
+
+    parquet_path = _fresh_parquet(csv_path)
+    if parquet_path is not None:
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(parquet_path, memory_map=True)
+        names = _matching_columns(parquet.schema_arrow.names, wanted)
+        for batch in parquet.iter_batches(batch_size=chunksize, columns=names):
+            df = batch.to_pandas(types_mapper=pd.ArrowDtype)
+            df = df.astype({c: dtype[c.strip().lower()] for c in df if c.strip().lower() in dtype})
+            yield _rename_to(df, out_names)
+        return
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = _matching_columns(header, wanted)
+    csv_dtype = {c: dtype[c.strip().lower()] for c in header if c.strip().lower() in dtype}
+
+    if csv_dtype and _arrow_dtype_names(csv_dtype) and pyarrow_available():
+        # Multi-threaded PyArrow parse; chunks follow its parse blocks.
+        for df in _iter_csv_pyarrow(csv_path, usecols, csv_dtype):
+            yield _rename_to(df, out_names)
+        return
+
+    read_kwargs = {"usecols": usecols, "dtype": csv_dtype}
+    if not csv_dtype:
+        read_kwargs = with_arrow_backend({k: v for k, v in read_kwargs.items() if k != "dtype"})
+    for df in pd.read_csv(csv_path, chunksize=chunksize, memory_map=True, **read_kwargs):
+        yield _rename_to(df, out_names)
+
+
+def _rename_to(df: pd.DataFrame, out_names: dict[str, str] | None) -> pd.DataFrame:
+    if out_names is not None:
+        df.columns = [out_names[c.strip().lower()] for c in df.columns]
+    return df
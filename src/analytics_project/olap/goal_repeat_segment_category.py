@@ -27,57 +27,54 @@ def get_db_path() -> Path:
 
 
 # ---------------------------------------------------------
-# Load data from DW
+# Load repeat-customer revenue by Category × Region from DW
 # ---------------------------------------------------------
-def load_data():
+# Slicing (repeat customers) and dicing (Category × Region) run inside SQLite,
+# so only the aggregated rows are loaded into pandas. Each sale carries its
+# customer's purchase count from a window over one scan of fact_sales. Rows
+# whose SaleAmount is not numeric are left out of the revenue total, and sales
+# without a product Category are dropped. Sales without a customer Region are
+# kept (Region is NULL) so they still count toward the per-category totals.
+# TransactionID is the fact_sales primary key, so counting rows counts
+# distinct transactions.
+REPEAT_SALES_SQL = """
+WITH counted AS (
+    SELECT
+        CustomerID,
+        ProductID,
+        SaleAmount,
+        COUNT(*) OVER (PARTITION BY CustomerID) AS CustomerPurchases
+    FROM fact_sales
+)
+SELECT
+    p.Category,
+    c.Region,
+    TOTAL(
+        CASE WHEN typeof(f.SaleAmount) IN ('integer', 'real') THEN f.SaleAmount END
+    ) AS TotalRepeatRevenue,
+    COUNT(*) AS RepeatPurchases
+FROM counted f
+LEFT JOIN dim_customer c ON f.CustomerID = c.CustomerID
+JOIN dim_product p ON f.ProductID = p.ProductID
+WHERE f.CustomerID IS NOT NULL
+    AND f.CustomerPurchases >= 2
+    AND p.Category IS NOT NULL
+GROUP BY p.Category, c.Region
+ORDER BY p.Category, c.Region;
+"""
+
+
+def load_data() -> pd.DataFrame:
     db_path = get_db_path()
     conn = sqlite3.connect(db_path)
 
-    fact_sales = pd.read_sql("SELECT * FROM fact_sales;", conn)
-    dim_customers = pd.read_sql("SELECT * FROM dim_customer;", conn)
-    dim_products = pd.read_sql("SELECT * FROM dim_product;", conn)
+    repeat_sales = pd.read_sql(REPEAT_SALES_SQL, conn)
 
     conn.close()
-    return fact_sales, dim_customers, dim_products
-
-
-# ---------------------------------------------------------
-# Prepare merged dataset + repeat-customer slice
-# ---------------------------------------------------------
-def prepare_sales_data(fact_sales, dim_customers, dim_products) -> pd.DataFrame:
-    # Ensure date is datetime
-    fact_sales["SaleDate"] = pd.to_datetime(fact_sales["SaleDate"])
-
-    # Create YearMonth (even if 1 month)
-    fact_sales["YearMonth"] = fact_sales["SaleDate"].dt.to_period("M").astype(str)
-
-    # Merge customer dimension (Region)
-    sales_cust = fact_sales.merge(
-        dim_customers[["CustomerID", "Region"]],
-        on="CustomerID",
-        how="left",
-    )
-
-    # Merge product dimension (Category)
-    sales_full = sales_cust.merge(
-        dim_products[["ProductID", "Category"]],
-        on="ProductID",
-        how="left",
-    )
-
-    # Ensure SaleAmount is numeric
-    sales_full["SaleAmount"] = pd.to_numeric(sales_full["SaleAmount"], errors="coerce")
-
-    # Identify repeat customers: 2+ transactions
-    purchase_counts = sales_full.groupby("CustomerID")["TransactionID"].nunique()
-    repeat_customers = purchase_counts[purchase_counts >= 2].index
-
-    # Mark repeat customers
-    sales_full["IsRepeatCustomer"] = sales_full["CustomerID"].isin(repeat_customers)
-
-    # Slice: keep only repeat customers
-    repeat_sales = sales_full[sales_full["IsRepeatCustomer"]].copy()
 
+    # Low-cardinality keys: group on integer codes instead of hashing strings
+    dims = ["Category", "Region"]
+    repeat_sales[dims] = repeat_sales[dims].astype("category")
     return repeat_sales
 
 
@@ -85,12 +82,10 @@ def prepare_sales_data(fact_sales, dim_customers, dim_products) -> pd.DataFrame:
 # Summaries (Category, Category×Region, Pivot)
 # ---------------------------------------------------------
 def summarize_by_category(repeat_sales):
+    # Each transaction has a single region, so the per-region counts add up
     summary = (
-        repeat_sales.groupby("Category")
-        .agg(
-            TotalRepeatRevenue=("SaleAmount", "sum"),
-            RepeatPurchases=("TransactionID", "nunique"),
-        )
+        repeat_sales.groupby("Category", observed=True)[["TotalRepeatRevenue", "RepeatPurchases"]]
+        .sum()
         .reset_index()
         .sort_values("TotalRepeatRevenue", ascending=False)
     )
@@ -98,18 +93,21 @@ def summarize_by_category(repeat_sales):
 
 
 def summarize_category_region(repeat_sales):
+    # Sales without a Region only count toward the per-category summary
     summary = (
-        repeat_sales.groupby(["Category", "Region"])
-        .agg(TotalRepeatRevenue=("SaleAmount", "sum"))
-        .reset_index()
+        repeat_sales.dropna(subset=["Region"])
+        .reset_index(drop=True)[["Category", "Region", "TotalRepeatRevenue"]]
         .sort_values("TotalRepeatRevenue", ascending=False)
     )
     return summary
 
 
 def pivot_category_region(repeat_sales):
-    pivot = repeat_sales.pivot_table(
-        index="Category", columns="Region", values="SaleAmount", aggfunc="sum", fill_value=0
+    # groupby drops the rows without a Region, as pivot_table did
+    pivot = (
+        repeat_sales.groupby(["Category", "Region"], observed=True)["TotalRepeatRevenue"]
+        .sum()
+        .unstack(fill_value=0)
     )
     pivot["Total"] = pivot.sum(axis=1)
     return pivot.sort_values("Total", ascending=False)
@@ -171,11 +169,8 @@ def plot_category_share(category_summary, output_dir: Path):
 # MAIN PIPELINE
 # ---------------------------------------------------------
 def main():
-    print("Loading data...")
-    fact_sales, dim_customers, dim_products = load_data()
-
-    print("Preparing sales data (Slicing repeat customers)...")
-    repeat_sales = prepare_sales_data(fact_sales, dim_customers, dim_products)
+    print("Loading repeat-customer sales by category and region...")
+    repeat_sales = load_data()
 
     print("Summarizing revenue by category...")
     category_summary = summarize_by_category(repeat_sales)
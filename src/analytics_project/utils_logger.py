@@ -1,18 +1,28 @@
 from __future__ import annotations
 import logging
+from logging.handlers import MemoryHandler
 from pathlib import Path
 
 # Project-level directory references
 PROJECT_DIR = Path(__file__).resolve().parents[2]
 LOG_FILE = PROJECT_DIR / "project.log"
 
+# File records are buffered and written in batches; ERROR and above flush at once
+LOG_BUFFER_CAPACITY = 1024
+
 _LOGGERS: dict[str, logging.Logger] = {}
 
+# One buffer shared by every logger, so project.log stays in time order
+_FILE_BUFFER: MemoryHandler | None = None
+
 
 def get_logger(name: str = "analytics_project") -> logging.Logger:
     """
     Create or return a shared logger configured to output to both the console and project.log.
 
+    Records for project.log are buffered and flushed in batches, on ERROR, at exit,
+    or by flush_logs().
+
     Parameters
     ----------
     name : str, optional
@@ -30,6 +40,11 @@ def get_logger(name: str = "analytics_project") -> logging.Logger:
     logger.setLevel(logging.INFO)
     logger.propagate = False  # Avoid duplicate logs
 
+    # A re-imported module (e.g. in a test session) finds its handlers already attached
+    if logger.hasHandlers():
+        _LOGGERS[name] = logger
+        return logger
+
     formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
 
     # Console handler
@@ -38,11 +53,33 @@ def get_logger(name: str = "analytics_project") -> logging.Logger:
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    # File handler
-    file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    logger.addHandler(_file_buffer(formatter))
 
     _LOGGERS[name] = logger
     return logger
+
+
+def flush_logs() -> None:
+    """
+    Write any buffered records to project.log.
+
+    Call this at the end of work run in a worker process (e.g. a
+    ProcessPoolExecutor task): workers exit without the at-exit flush, so
+    records still in the buffer would be lost.
+    """
+    if _FILE_BUFFER is not None:
+        _FILE_BUFFER.flush()
+
+
+def _file_buffer(formatter: logging.Formatter) -> MemoryHandler:
+    global _FILE_BUFFER
+    if _FILE_BUFFER is None:
+        # File handler: the file is opened on the first flush, not when the logger is created
+        file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8", delay=True)
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(formatter)
+        _FILE_BUFFER = MemoryHandler(
+            capacity=LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=file_handler
+        )
+        _FILE_BUFFER.setLevel(logging.INFO)
+    return _FILE_BUFFER
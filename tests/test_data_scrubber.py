@@ -0,0 +1,118 @@
+"""Test the lazy DataScrubber cleaning steps.
+
+Module Information:
+    - Filename: test_data_scrubber.py
+    - Module: test_data_scrubber
+    - Location: tests/
+
+These tests verify that:
+    - Cleaning steps are recorded and only run when the frame is needed
+    - The caller's DataFrame is never modified
+    - _fuse skips steps that cannot change their neighbour's result
+    - from_parquet reads back what to_parquet wrote, optionally by column
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_project.data_scrubber import DataScrubber, _fuse
+
+
+def _raw_frame():
+    return pd.DataFrame(
+        {
+            " Customer ID ": [1, 1, 2, np.nan],
+            "Region": [" East", " East", "West ", np.nan],
+        }
+    )
+
+
+def test_steps_are_deferred_until_df_is_read():
+    """Verify methods only record steps and the frame is cleaned on first access."""
+    scrubber = DataScrubber(_raw_frame()).standardize_column_names().drop_duplicates()
+
+    assert len(scrubber._ops) == 2
+    assert list(scrubber._df.columns) == [" Customer ID ", "Region"]
+
+    df = scrubber.df
+
+    assert scrubber._ops == []
+    assert list(df.columns) == ["customer_id", "region"]
+    assert len(df) == 3
+
+
+def test_chain_matches_eager_pandas():
+    """Verify a full chain gives the same frame as the equivalent pandas calls."""
+    raw = _raw_frame()
+
+    result = (
+        DataScrubber(raw)
+        .standardize_column_names()
+        .drop_duplicates()
+        .drop_empty_rows()
+        .strip_whitespace()
+        .get_df()
+    )
+
+    expected = raw.set_axis(["customer_id", "region"], axis=1).drop_duplicates().dropna(how="all")
+    assert result["customer_id"].tolist() == expected["customer_id"].tolist()
+    assert result["region"].astype(str).tolist() == ["East", "West"]
+
+
+def test_caller_frame_is_not_modified():
+    """Verify cleaning never writes through to the DataFrame passed in."""
+    raw = _raw_frame()
+    before = raw.copy()
+
+    DataScrubber(raw).standardize_column_names().strip_whitespace().fill_na(
+        {"region": "Unknown"}
+    ).get_df()
+
+    pd.testing.assert_frame_equal(raw, before)
+
+
+def test_setting_df_discards_pending_steps():
+    """Verify assigning df replaces the frame and drops queued steps."""
+    scrubber = DataScrubber(_raw_frame()).drop_duplicates()
+    replacement = pd.DataFrame({"a": [1, 1]})
+
+    scrubber.df = replacement
+
+    assert scrubber._ops == []
+    assert scrubber.df["a"].tolist() == [1, 1]
+
+
+def test_fuse_skips_repeated_steps():
+    """Verify a step repeated with the same arguments runs once."""
+    scrubber = DataScrubber(_raw_frame()).drop_duplicates().drop_duplicates()
+    scrubber.drop_duplicates(subset=["Region"])
+
+    keys = [key for key, _ in _fuse(scrubber._ops)]
+
+    assert keys == [("drop_duplicates", None), ("drop_duplicates", ["Region"])]
+
+
+def test_fuse_merges_empty_row_and_na_row_drops():
+    """Verify drop_empty_rows next to drop_na_rows() collapses to drop_na_rows."""
+    before = DataScrubber(_raw_frame()).drop_empty_rows().drop_na_rows()
+    after = DataScrubber(_raw_frame()).drop_na_rows().drop_empty_rows()
+
+    assert [key for key, _ in _fuse(before._ops)] == [("drop_na_rows", None)]
+    assert [key for key, _ in _fuse(after._ops)] == [("drop_na_rows", None)]
+    assert len(before.df) == len(after.df) == 3
+
+
+def test_from_parquet_round_trip_and_column_pruning(tmp_path):
+    """Verify from_parquet reads a to_parquet file, decoding only `columns` when given."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "customers.parquet"
+    DataScrubber(_raw_frame()).standardize_column_names().drop_empty_rows().to_parquet(path)
+
+    full = DataScrubber.from_parquet(path).get_df()
+    keys = DataScrubber.from_parquet(path, columns=["customer_id"]).drop_duplicates().get_df()
+
+    assert list(full.columns) == ["customer_id", "region"]
+    assert full["region"].tolist() == [" East", " East", "West "]
+    assert list(keys.columns) == ["customer_id"]
+    assert keys["customer_id"].tolist() == [1, 2]
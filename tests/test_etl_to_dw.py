@@ -0,0 +1,164 @@
+"""Test the ETL load into the data warehouse.
+
+Module Information:
+    - Filename: test_etl_to_dw.py
+    - Module: test_etl_to_dw
+    - Location: tests/
+
+These tests verify that:
+    - The committed processed files load into a fresh DW
+    - A load is skipped while sources are unchanged, and redone after a
+      source changes or with force=True
+    - A skipped load does not change the DW's pragmas, and the stored
+      signature uses project-relative paths
+    - Dates are validated the same way whatever their input format
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project import etl_to_dw, io_utils
+from analytics_project.etl_to_dw import _to_iso_dates
+
+
+def _table_counts(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("dim_customer", "dim_product", "fact_sales")
+        }
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("use_pyarrow", [True, False])
+def test_load_committed_processed_files(tmp_path, monkeypatch, use_pyarrow):
+    """Verify the repo's processed CSVs (e.g. campaignid written as 0.0) load cleanly."""
+    if use_pyarrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(io_utils, "pyarrow_available", lambda: False)
+        monkeypatch.setattr(etl_to_dw, "pyarrow_available", lambda: False)
+    db_path = tmp_path / "smart_sales.db"
+    monkeypatch.setattr(etl_to_dw, "DB_PATH", db_path)
+
+    etl_to_dw.load_data_to_dw(force=True)
+
+    # Every processed row except the one with an invalid SaleDate (2023-13-01)
+    assert _table_counts(db_path) == {"dim_customer": 200, "dim_product": 100, "fact_sales": 1999}
+    conn = sqlite3.connect(db_path)
+    campaign_types = {row[0] for row in conn.execute("SELECT typeof(CampaignID) FROM fact_sales")}
+    conn.close()
+    assert campaign_types <= {"integer", "null"}
+
+
+@pytest.fixture
+def tmp_dw(tmp_path, monkeypatch):
+    """Point the ETL at copies of the processed files and a DW under tmp_path."""
+    sources = []
+    for path in etl_to_dw.SOURCE_PATHS:
+        sources.append(tmp_path / path.name)
+        shutil.copy(path, sources[-1])
+    customers, products, sales = sources
+    monkeypatch.setattr(etl_to_dw, "CUSTOMERS_PATH", customers)
+    monkeypatch.setattr(etl_to_dw, "PRODUCTS_PATH", products)
+    monkeypatch.setattr(etl_to_dw, "SALES_PATH", sales)
+    monkeypatch.setattr(etl_to_dw, "SOURCE_PATHS", tuple(sources))
+    monkeypatch.setattr(etl_to_dw, "DB_PATH", tmp_path / "smart_sales.db")
+    return tmp_path
+
+
+def _clear_fact_sales(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM fact_sales")
+    conn.commit()
+    conn.close()
+
+
+def test_unchanged_sources_skip_the_reload(tmp_dw):
+    """Verify a second load with the same sources leaves the DW untouched."""
+    etl_to_dw.load_data_to_dw()
+    _clear_fact_sales(etl_to_dw.DB_PATH)
+
+    etl_to_dw.load_data_to_dw()
+
+    assert _table_counts(etl_to_dw.DB_PATH)["fact_sales"] == 0
+
+
+def test_skipped_load_leaves_journal_mode_alone(tmp_dw):
+    """Verify the bulk-load pragmas are only applied when a load runs."""
+    etl_to_dw.load_data_to_dw()
+    conn = sqlite3.connect(etl_to_dw.DB_PATH)
+    conn.execute("PRAGMA journal_mode=DELETE")
+    conn.close()
+
+    etl_to_dw.load_data_to_dw()
+
+    conn = sqlite3.connect(etl_to_dw.DB_PATH)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    assert journal_mode == "delete"
+
+
+def test_signature_paths_are_relative_to_project_root():
+    """Verify the stored signature does not embed this checkout's location."""
+    paths = [entry[0] for entry in json.loads(etl_to_dw.source_signature())]
+
+    assert "data/processed/sales_data_clean.csv" in paths
+    assert "src/analytics_project/etl_to_dw.py" in paths
+    assert not any(path.startswith(str(etl_to_dw.PROJECT_ROOT)) for path in paths)
+
+
+def test_touched_source_triggers_a_reload(tmp_dw):
+    """Verify a newer source file mtime makes the next load run again."""
+    etl_to_dw.load_data_to_dw()
+    _clear_fact_sales(etl_to_dw.DB_PATH)
+    st = etl_to_dw.SALES_PATH.stat()
+    os.utime(etl_to_dw.SALES_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    etl_to_dw.load_data_to_dw()
+
+    assert _table_counts(etl_to_dw.DB_PATH)["fact_sales"] == 1999
+
+
+def test_changed_loader_code_triggers_a_reload(tmp_dw, monkeypatch):
+    """Verify editing the loader code invalidates the stored signature."""
+    etl_to_dw.load_data_to_dw()
+    _clear_fact_sales(etl_to_dw.DB_PATH)
+    loader = tmp_dw / "loader.py"
+    loader.write_text("# edited\n")
+    monkeypatch.setattr(etl_to_dw, "LOADER_PATHS", (*etl_to_dw.LOADER_PATHS, loader))
+
+    etl_to_dw.load_data_to_dw()
+
+    assert _table_counts(etl_to_dw.DB_PATH)["fact_sales"] == 1999
+
+
+def test_force_reloads_unchanged_sources(tmp_dw):
+    """Verify force=True reloads even when the signature matches."""
+    etl_to_dw.load_data_to_dw()
+    _clear_fact_sales(etl_to_dw.DB_PATH)
+
+    etl_to_dw.load_data_to_dw(force=True)
+
+    assert _table_counts(etl_to_dw.DB_PATH) == {
+        "dim_customer": 200,
+        "dim_product": 100,
+        "fact_sales": 1999,
+    }
+
+
+def test_iso_and_us_dates_reject_the_same_impossible_days():
+    """Verify 2023-02-30 is dropped whether it arrives as ISO or M/D/YYYY."""
+    iso = _to_iso_dates(pd.Series(["2023-02-28", "2023-02-30", "2024-02-29"]))
+    us = _to_iso_dates(pd.Series(["2/28/2023", "2/30/2023", "2/29/2024"]))
+
+    assert iso.isna().tolist() == [False, True, False]
+    assert iso.tolist()[::2] == us.tolist()[::2] == ["2023-02-28", "2024-02-29"]
+    assert us.isna().tolist() == [False, True, False]
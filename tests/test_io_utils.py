@@ -0,0 +1,71 @@
+"""Test the shared CSV readers.
+
+Module Information:
+    - Filename: test_io_utils.py
+    - Module: test_io_utils
+    - Location: tests/
+
+These tests verify that:
+    - Declared columns are read with their declared dtypes
+    - Undeclared columns come back Arrow-backed, with or without a `dtype`
+"""
+
+import pandas as pd
+import pytest
+
+from analytics_project.io_utils import FAST_IO_ENV, iter_processed, read_csv_to_df
+
+CSV = """ProductID,ProductName,UnitPrice,StockQuantity,Supplier_Cat
+2001,Laptop,799.99,12,Acme
+2002, Desk ,,,
+"""
+
+DTYPE = {"ProductID": "Int32", "ProductName": "str", "UnitPrice": "float64"}
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """Write a small raw CSV and make sure the Polars reader is not selected."""
+    pytest.importorskip("pyarrow")
+    monkeypatch.delenv(FAST_IO_ENV, raising=False)
+    path = tmp_path / "products_data.csv"
+    path.write_text(CSV)
+    return path
+
+
+def _arrow_backed(df, columns):
+    return all(isinstance(df[col].dtype, pd.ArrowDtype) for col in columns)
+
+
+def test_read_without_dtype_is_arrow_backed(csv_path):
+    """Verify every column is Arrow-backed when no dtype is declared."""
+    df = read_csv_to_df(csv_path)
+
+    assert _arrow_backed(df, df.columns)
+    assert str(df["StockQuantity"].dtype) == "int64[pyarrow]"
+    assert df["StockQuantity"].isna().tolist() == [False, True]
+
+
+def test_read_with_dtype_keeps_undeclared_columns_arrow_backed(csv_path):
+    """Verify declared columns use `dtype` and the others are Arrow-backed."""
+    df = read_csv_to_df(csv_path, dtype=DTYPE)
+
+    assert list(df.columns) == [*DTYPE, "StockQuantity", "Supplier_Cat"]
+    assert {col: str(df[col].dtype) for col in DTYPE} == {
+        "ProductID": "Int32",
+        "ProductName": "str",
+        "UnitPrice": "float64",
+    }
+    assert _arrow_backed(df, ["StockQuantity", "Supplier_Cat"])
+    assert df["Supplier_Cat"].isna().tolist() == [False, True]
+
+
+def test_iter_processed_keeps_undeclared_columns_arrow_backed(csv_path):
+    """Verify the chunked reader converts columns the same way as read_csv_to_df."""
+    dtype = {col.lower(): t for col, t in DTYPE.items()}
+
+    chunks = list(iter_processed(csv_path, dtype=dtype))
+
+    df = pd.concat(chunks)
+    assert str(df["ProductID"].dtype) == "Int32"
+    assert _arrow_backed(df, ["StockQuantity", "Supplier_Cat"])
@@ -0,0 +1,142 @@
+"""Test the repeat-customer OLAP summaries.
+
+Module Information:
+    - Filename: test_olap_repeat_segment.py
+    - Module: test_olap_repeat_segment
+    - Location: tests/
+
+These tests verify that the SQL aggregation in REPEAT_SALES_SQL gives the
+same summaries as the original pandas merge + groupby logic, including sales
+whose customer has no Region or is missing from dim_customer.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project.etl_to_dw import create_schema
+from analytics_project.olap import goal_repeat_segment_category as olap
+
+CUSTOMERS = [
+    (1, "Ann", "East"),
+    (2, "Bob", None),  # repeat customer without a Region
+    (3, "Cy", "West"),
+    (4, "Di", "East"),  # single purchase: not a repeat customer
+]
+
+PRODUCTS = [
+    (10, "Lamp", "Home"),
+    (11, "Pen", "Office"),
+    (12, "Mystery", None),
+]
+
+# (TransactionID, CustomerID, ProductID, SaleAmount)
+SALES = [
+    (1, 1, 10, 100.0),
+    (2, 1, 11, 20.0),
+    (3, 1, 12, 5.0),
+    (4, 2, 10, 50.0),
+    (5, 2, 10, "?"),
+    (6, 3, 11, 30.0),
+    (7, 3, 10, 70.0),
+    (8, 4, 10, 999.0),
+    (9, 5, 10, 40.0),  # customer 5 is missing from dim_customer
+    (10, 5, 11, 15.0),
+    (11, None, 10, 60.0),  # no customer at all
+    (12, None, 10, 60.0),
+    (13, 1, 99, 80.0),  # product missing from dim_product
+]
+
+
+@pytest.fixture
+def dw_path(tmp_path, monkeypatch):
+    """Build a small DW under tmp_path and point the OLAP module at it."""
+    db_path = tmp_path / "smart_sales.db"
+    conn = sqlite3.connect(db_path)
+    create_schema(conn)
+    conn.executemany(
+        "INSERT INTO dim_customer (CustomerID, Name, Region) VALUES (?, ?, ?)", CUSTOMERS
+    )
+    conn.executemany(
+        "INSERT INTO dim_product (ProductID, ProductName, Category) VALUES (?, ?, ?)", PRODUCTS
+    )
+    conn.executemany(
+        "INSERT INTO fact_sales (TransactionID, SaleDate, CustomerID, ProductID, SaleAmount)"
+        " VALUES (?, '2025-05-04', ?, ?, ?)",
+        SALES,
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(olap, "get_db_path", lambda: db_path)
+    return db_path
+
+
+def _pandas_repeat_sales(db_path):
+    """Repeat-customer slice computed the original way: SELECT * + merges."""
+    conn = sqlite3.connect(db_path)
+    fact_sales = pd.read_sql("SELECT * FROM fact_sales;", conn)
+    dim_customers = pd.read_sql("SELECT * FROM dim_customer;", conn)
+    dim_products = pd.read_sql("SELECT * FROM dim_product;", conn)
+    conn.close()
+
+    sales = fact_sales.merge(dim_customers[["CustomerID", "Region"]], on="CustomerID", how="left")
+    sales = sales.merge(dim_products[["ProductID", "Category"]], on="ProductID", how="left")
+    sales["SaleAmount"] = pd.to_numeric(sales["SaleAmount"], errors="coerce")
+    purchase_counts = sales.groupby("CustomerID")["TransactionID"].nunique()
+    repeat_customers = purchase_counts[purchase_counts >= 2].index
+    return sales[sales["CustomerID"].isin(repeat_customers)]
+
+
+def test_category_summary_matches_pandas(dw_path):
+    """Verify per-category revenue and purchases include sales without a Region."""
+    expected = (
+        _pandas_repeat_sales(dw_path)
+        .groupby("Category")
+        .agg(
+            TotalRepeatRevenue=("SaleAmount", "sum"),
+            RepeatPurchases=("TransactionID", "nunique"),
+        )
+        .reset_index()
+        .sort_values("TotalRepeatRevenue", ascending=False)
+    )
+
+    result = olap.summarize_by_category(olap.load_data())
+
+    assert result["Category"].astype(str).tolist() == expected["Category"].tolist()
+    assert result["TotalRepeatRevenue"].tolist() == expected["TotalRepeatRevenue"].tolist()
+    assert result["RepeatPurchases"].tolist() == expected["RepeatPurchases"].tolist()
+    # Home: Ann 100 + Bob 50 (no Region, "?" skipped) + Cy 70 + customer 5's 40
+    assert result.set_index("Category").loc["Home"].tolist() == [260.0, 5]
+
+
+def test_category_region_summary_matches_pandas(dw_path):
+    """Verify the Category x Region summary leaves out sales without a Region."""
+    expected = (
+        _pandas_repeat_sales(dw_path)
+        .groupby(["Category", "Region"])
+        .agg(TotalRepeatRevenue=("SaleAmount", "sum"))
+        .reset_index()
+        .sort_values("TotalRepeatRevenue", ascending=False)
+    )
+
+    result = olap.summarize_category_region(olap.load_data())
+
+    assert result.index.tolist() == expected.index.tolist()
+    assert result["Region"].astype(str).tolist() == expected["Region"].tolist()
+    assert result["TotalRepeatRevenue"].tolist() == expected["TotalRepeatRevenue"].tolist()
+
+
+def test_pivot_matches_pandas(dw_path):
+    """Verify the pivot matches pivot_table over the merged sales."""
+    expected = _pandas_repeat_sales(dw_path).pivot_table(
+        index="Category", columns="Region", values="SaleAmount", aggfunc="sum", fill_value=0
+    )
+    expected["Total"] = expected.sum(axis=1)
+    expected = expected.sort_values("Total", ascending=False)
+
+    result = olap.pivot_category_region(olap.load_data())
+
+    assert result.index.astype(str).tolist() == expected.index.tolist()
+    assert result.columns.astype(str).tolist() == expected.columns.tolist()
+    assert result.to_numpy().tolist() == expected.to_numpy().tolist()
@@ -0,0 +1,119 @@
+"""Test the shared cleaning pipeline.
+
+Module Information:
+    - Filename: test_prep_pipeline.py
+    - Module: test_prep_pipeline
+    - Location: tests/
+
+These tests verify that:
+    - Raw files with blanks and extra columns load with the declared schema
+    - clean_table drops the right rows and logs counts for kept rows only
+    - clean_table clips columns that still contain missing values
+    - clean_table handles frames where every row is filtered out
+"""
+
+from dataclasses import replace
+
+import pandas as pd
+
+from analytics_project.data_preparation.prep_pipeline import (
+    PRODUCTS_SPEC,
+    SALES_SPEC,
+    clean_table,
+    load_table,
+)
+
+SALES_CSV = """TransactionID,SaleDate,CustomerID,ProductID,StoreID,CampaignID,SaleAmount,BonusPoints_Num,PaymentType_Cat,QuantitySold
+1,5/4/2025,1034,2059,402,0,2048.2,150,Online,3
+2,5/4/2025,1066,2048,,1,321.87,30,Debit,
+3,5/5/2025,1012,2011,403,,?,60,Cash,-2
+"""
+
+
+def test_load_table_keeps_blanks_and_extra_columns(tmp_path):
+    """Verify blank integer fields load as NA and undeclared columns are kept."""
+    raw = tmp_path / "sales_data.csv"
+    raw.write_text(SALES_CSV)
+    spec = replace(SALES_SPEC, raw=raw, out=tmp_path / "sales_data_clean.csv")
+
+    df = load_table(spec)
+
+    assert str(df["StoreID"].dtype) == "Int32"
+    assert df["StoreID"].isna().tolist() == [False, True, False]
+    assert df["CampaignID"].isna().tolist() == [False, False, True]
+    assert "QuantitySold" in df.columns
+
+
+def test_clean_table_fills_and_clips_extra_columns(tmp_path):
+    """Verify the spec's fill/clip columns apply when the raw file has them."""
+    raw = tmp_path / "sales_data.csv"
+    raw.write_text(SALES_CSV)
+    spec = replace(SALES_SPEC, raw=raw, out=tmp_path / "sales_data_clean.csv")
+
+    result = clean_table(load_table(spec), spec)
+
+    assert result["QuantitySold"].tolist() == [3, 0, 0]
+
+
+def test_clean_table_masks_and_log_counts(caplog):
+    """Verify each filter's rows and logged counts match a step-by-step clean."""
+    df = pd.DataFrame(
+        {
+            "ProductID": pd.array([1, 1, 2, None, 3, 4, 5, 6, 7, 8], dtype="Int32"),
+            "ProductName": list("aabcdefghi"),
+            "UnitPrice": [10.0, 10.0, 11.0, 12.0, 9.0, 10.0, 11.0, 10.0, 12.0, 1000.0],
+            "StockQuantity": pd.array([5, 5, None, None, -3, 6, 5, 4, 6, 5], dtype="Int32"),
+        }
+    )
+    before = df.copy()
+
+    with caplog.at_level("INFO"):
+        result = clean_table(df, PRODUCTS_SPEC)
+
+    # Row 1 duplicates row 0, row 3 has no ProductID, row 9 is a price outlier
+    assert result["ProductID"].tolist() == [1, 2, 3, 4, 5, 6, 7]
+    assert result["StockQuantity"].tolist() == [5, 0, 0, 6, 5, 4, 6]
+    # The blank StockQuantity on the dropped row 3 is not counted as filled
+    for message in (
+        "Dropped 1 duplicate products rows",
+        "Dropped 1 rows with missing key products fields",
+        "Filled 1 missing StockQuantity values with 0",
+        "Set 1 negative StockQuantity values to 0",
+        "Removed 1 rows as numeric outliers",
+        "Final products shape after cleaning: (7, 4)",
+    ):
+        assert message in caplog.text
+    pd.testing.assert_frame_equal(df, before)
+
+
+def test_clean_table_clips_column_with_missing_values(caplog):
+    """Verify a non_neg_cols column with NA is clipped without being filled first."""
+    spec = replace(PRODUCTS_SPEC, fillna_zero_cols=())
+    df = pd.DataFrame(
+        {
+            "ProductID": pd.array([1, 2, 3, 4], dtype="Int32"),
+            "StockQuantity": pd.array([5, None, -1, 4], dtype="Int32"),
+        }
+    )
+
+    with caplog.at_level("INFO"):
+        result = clean_table(df, spec)
+
+    assert "Set 1 negative StockQuantity values to 0" in caplog.text
+    assert (result["StockQuantity"].dropna() >= 0).all()
+
+
+def test_clean_table_all_keys_missing_returns_empty_frame():
+    """Verify a frame with no valid keys comes back empty instead of raising."""
+    df = pd.DataFrame(
+        {
+            "ProductID": pd.array([None, None], dtype="Int32"),
+            "ProductName": ["Laptop", "Desk"],
+            "UnitPrice": [999.0, 150.0],
+        }
+    )
+
+    result = clean_table(df, PRODUCTS_SPEC)
+
+    assert result.empty
+    assert list(result.columns) == ["ProductID", "ProductName", "UnitPrice"]